@@ -1,12 +1,16 @@
 import sys
-import xml.etree.ElementTree as ET
+import functools
+import hashlib
+from collections import OrderedDict
+from lxml import etree as ET
 from xml.sax import handler
-import numpy as np
 from datetime import datetime
-from scipy.linalg import solveh_banded
-from numpy.testing import assert_almost_equal
 import logging
+import mmap
 import os
+import shutil
+import tempfile
+from typing import TYPE_CHECKING
 
 logging.basicConfig(
     filename="application.log",
@@ -18,32 +22,233 @@ logging.basicConfig(
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTreeView, QTextEdit, QMenuBar, QMenu, QAction, QFileDialog,
-    QSplitter, QLabel, QPushButton, QScrollArea, QAbstractItemView,
+    QSplitter, QLabel, QPushButton, QAbstractItemView,
     QStyle, QMessageBox, QComboBox
 )
-from PyQt5.QtGui import QStandardItemModel, QStandardItem, QFont, QIcon, QTextOption
-from PyQt5.QtCore import Qt, QSize
-
-from strudbpkg.structuraldb import StructuralDatabase
-
-class QTextEditLogger(QMainWindow):
+from PyQt5.QtGui import QFont, QIcon, QTextOption
+from PyQt5.QtCore import Qt, QSize, QTimer, QAbstractItemModel, QModelIndex
+
+# numpy, scipy and the structural database are imported where they are used,
+# so the main window does not wait on their import chains
+if TYPE_CHECKING:
+    from strudbpkg.structuraldb import StructuralDatabase
+
+_APP_STYLE = """
+QMainWindow {
+    background-color: #111111; /* Dark brilliant black */
+    color: #78909C /* Keeps text color white */
+}
+QMenuBar, QMenu {
+    background-color: #2e2e2e;
+    color: #78909C;
+}
+QTreeView, QTextEdit {
+    background-color: #1e1e1e;
+    color: #cccccc;
+    border: 1px solid #3e3e3e;
+    font-family: 'Courier';
+    font-size: 16pt;
+}
+QLabel {
+    color: #ffffff;
+}
+QPushButton {
+    background-color: #3e3e3e;
+    color: #ffffff;
+    border: none;
+}
+QPushButton:hover {
+    background-color: #5e5e5e;
+}
+QScrollBar:vertical, QScrollBar:horizontal {
+    background: #3e3e3e;
+    width: 10px;  /* Set a smaller width for vertical scroll bars */
+    height: 10px;  /* Set a smaller height for horizontal scroll bars */
+}
+QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+    background: #888;
+    border-radius: 4px;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
+QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+    background: #2e2e2e;
+    border: none;
+}
+QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical,
+QScrollBar::left-arrow:horizontal, QScrollBar::right-arrow:horizontal {
+    background: #2e2e2e;
+}
+QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical,
+QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
+    background: none;
+}
+"""
+
+# Match xml.etree behaviour: comments and processing instructions are not tree nodes
+_XML_PARSER = ET.XMLParser(remove_comments=True, remove_pis=True)
+_XML_CACHE_SIZE = 8
+
+def _xml_digest(data):
+    """Short content hash used to skip re-validating unchanged XML buffers"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+# Shared fonts and sizes, created by _init_constants() once a QApplication exists
+_FONT_COURIER_16 = None
+_FONT_ARIAL_12 = None
+_FONT_ARIAL_16 = None
+_FONT_ARIAL_20 = None
+_ICON_SIZE_30 = None
+
+def _init_constants():
+    """Build the shared QFont/QSize constants on first use"""
+    global _FONT_COURIER_16, _FONT_ARIAL_12, _FONT_ARIAL_16, _FONT_ARIAL_20, _ICON_SIZE_30
+    if _FONT_COURIER_16 is not None:
+        return
+    _FONT_COURIER_16 = QFont("Courier", 16)
+    _FONT_ARIAL_12 = QFont("Arial", 12)
+    _FONT_ARIAL_16 = QFont("Arial", 16)
+    _FONT_ARIAL_20 = QFont("Arial", 20)
+    _ICON_SIZE_30 = QSize(30, 30)
+
+@functools.lru_cache(maxsize=None)
+def _std_icon(standard_pixmap):
+    """Application style icon, looked up once per process"""
+    return QApplication.instance().style().standardIcon(standard_pixmap)
+
+def _read_text_file(path):
+    """Read a whole text file with one buffered binary read and a single decode"""
+    with open(path, 'rb', buffering=1 << 20) as f:
+        data = f.read()
+    return data.decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+class QTextEditLogger(logging.Handler):
     def __init__(self, text_edit: QTextEdit):
         super().__init__()
         self.text_edit = text_edit
+        # Records are buffered and appended in one block, 30 ms after the first one arrives.
+        # The timer is parented to the text edit so it lives in the GUI thread with it.
+        self._buf = []
+        self._flush_timer = QTimer(text_edit)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(30)
+        self._flush_timer.timeout.connect(self.flush)
+        QApplication.instance().aboutToQuit.connect(self.flush)
 
     def emit(self, record):
         msg = self.format(record)
-        self.text_edit.append(msg)
+        if not self._buf:
+            self._flush_timer.start()
+        self._buf.append(msg)
+
+    def flush(self):
+        # Nothing buffered means no timer is pending; this also keeps logging.shutdown()
+        # from touching Qt objects that are already gone
+        if not self._buf:
+            return
+        self._flush_timer.stop()
+        self.text_edit.append('\n'.join(self._buf))
+        self._buf.clear()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+class _XmlNode:
+    """One row of the XML tree: an element, or a single line of its text"""
+    __slots__ = ('parent', 'row', 'element', 'line', 'children')
+
+    def __init__(self, parent, row, element, line=None):
+        self.parent = parent
+        self.row = row
+        self.element = element
+        self.line = line
+        # Text lines are leaves; element rows are filled in on first access
+        self.children = [] if line is not None else None
+
+class XmlTreeModel(QAbstractItemModel):
+    """Read-only tree model over an lxml element tree; rows are only built when the view asks for them"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _XmlNode(None, 0, None)
+        self._root.children = []
+
+    def set_root_element(self, root_elem):
+        self.beginResetModel()
+        self._root = _XmlNode(None, 0, None)
+        self._root.children = [_XmlNode(self._root, 0, root_elem)]
+        self.endResetModel()
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _children(self, node):
+        if node.children is None:
+            element = node.element
+            rows = []
+            if element.text and element.text.strip():
+                rows = [(element, line) for line in element.text.strip().split('\n')]
+            rows.extend((child, None) for child in element)
+            node.children = [_XmlNode(node, row, elem, line) for row, (elem, line) in enumerate(rows)]
+        return node.children
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self._children(self._node(parent))[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node.children is not None:
+            return bool(node.children)
+        # Answer from the element itself so drawing an expand arrow does not build the next level
+        element = node.element
+        return len(element) > 0 or bool(element.text and element.text.strip())
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._children(self._node(parent)))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        node = index.internalPointer()
+        return node.line if node.line is not None else node.element.tag
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "XML Structure"
+        return None
 
 class MainWindow(QMainWindow):
-    def __init__(self, db: StructuralDatabase):
+    def __init__(self, db: 'StructuralDatabase'):
         super().__init__()
+        _init_constants()
         self.db = db
         #self.setStyleSheet("background-color: #111111; color: #78909C;")
         self.setGeometry(100, 100, 1000, 700)
         # Keep track of the file you opened (or saved to)
         self.current_file: str = ''
+        # Directory the open dialog starts in; the last opened file's folder once there is one
+        self._last_dir: str = ''
         self.is_modified = False
+        # Digests of buffers already known to be well-formed XML
+        self._valid_xml_digests = OrderedDict()
+        # Cached LAPACK factorization of self.db.tk, reset whenever it is reassembled
+        self._tk_factor = None
+        # (tk, al) as assembled by k_assem/bound3 since the model was last loaded
+        self._assembly = None
 
     # def initializeUI(self):
         screen = QApplication.primaryScreen().size()
@@ -58,67 +263,14 @@ class MainWindow(QMainWindow):
         from PyQt5.QtGui import QIcon
         self.setWindowIcon(QIcon("evcilogop.jpg"))
 
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #111111; /* Dark brilliant black */
-                color: #78909C /* Keeps text color white */
-            }
-            QMenuBar, QMenu {
-                background-color: #2e2e2e;
-                color: #78909C;
-            }
-            QTreeView, QTextEdit {
-                background-color: #1e1e1e;
-                color: #cccccc;
-                border: 1px solid #3e3e3e;
-                font-family: 'Courier';
-                font-size: 16pt;
-            }
-            QScrollArea {
-                border: none;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #3e3e3e;
-                color: #ffffff;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #5e5e5e;
-            }
-            QScrollBar:vertical, QScrollBar:horizontal {
-                background: #3e3e3e;
-                width: 10px;  /* Set a smaller width for vertical scroll bars */
-                height: 10px;  /* Set a smaller height for horizontal scroll bars */
-            }
-            QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                background: #888;
-                border-radius: 4px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                background: #2e2e2e;
-                border: none;
-            }
-            QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical,
-            QScrollBar::left-arrow:horizontal, QScrollBar::right-arrow:horizontal {
-                background: #2e2e2e;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical,
-            QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
-                background: none.
-            }
-        """)
-        common_font = QFont("Courier", 16)
+        common_font = _FONT_COURIER_16
         
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         main_layout = QVBoxLayout(main_widget)
 
         self.banner_label = QLabel("Structural Analysis of Frames, Trusses and Grids")
-        self.banner_label.setFont(QFont("Arial", 16))   
+        self.banner_label.setFont(_FONT_ARIAL_16)   
         self.banner_label.setAlignment(Qt.AlignCenter)
         self.banner_label.setStyleSheet("color: #007ACC;")
         main_layout.addWidget(self.banner_label)
@@ -127,7 +279,7 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(title_bar_layout)
 
         title_label = QLabel("Selected Analysis Type")
-        title_label.setFont(QFont("Arial", 20))
+        title_label.setFont(_FONT_ARIAL_20)
         title_bar_layout.addWidget(title_label, alignment=Qt.AlignLeft)
         
         self.analysis_type_combo = QComboBox()
@@ -142,30 +294,28 @@ class MainWindow(QMainWindow):
         self.analysis_type_combo.setCurrentIndex(0)
         title_bar_layout.addWidget(self.analysis_type_combo, alignment=Qt.AlignRight)        
 
-        style = QApplication.instance().style()
-
-        open_icon = style.standardIcon(QStyle.SP_DialogOpenButton)
-        save_icon = style.standardIcon(QStyle.SP_DialogSaveButton)
-        exit_icon = style.standardIcon(QStyle.SP_DialogCloseButton)
-        help_icon = style.standardIcon(QStyle.SP_DialogHelpButton)
+        open_icon = _std_icon(QStyle.SP_DialogOpenButton)
+        save_icon = _std_icon(QStyle.SP_DialogSaveButton)
+        exit_icon = _std_icon(QStyle.SP_DialogCloseButton)
+        help_icon = _std_icon(QStyle.SP_DialogHelpButton)
         
         open_action = QAction(open_icon, "Open…", self)
         open_action.triggered.connect(self.open_file)
         exit_action = QAction(exit_icon, "Exit", self)
         exit_action.triggered.connect(self.close)
-        run_icon = style.standardIcon(QStyle.SP_MediaPlay)
+        run_icon = _std_icon(QStyle.SP_MediaPlay)
 
         # region buttons
         open_button = QPushButton()
         open_button.setIcon(open_icon)
-        open_button.setIconSize(QSize(30, 30))
+        open_button.setIconSize(_ICON_SIZE_30)
         open_button.clicked.connect(self.open_file)
         open_button.setToolTip("Open XML File")
         title_bar_layout.addWidget(open_button, alignment=Qt.AlignRight)
 
         self.save_button = QPushButton()
         self.save_button.setIcon(save_icon)
-        self.save_button.setIconSize(QSize(30, 30))
+        self.save_button.setIconSize(_ICON_SIZE_30)
         self.save_button.clicked.connect(self.save_file)
         self.save_button.setToolTip("Save XML File")
         self.save_button.setEnabled(False)
@@ -173,14 +323,14 @@ class MainWindow(QMainWindow):
 
         close_button = QPushButton()
         close_button.setIcon(exit_icon)
-        close_button.setIconSize(QSize(30, 30))
+        close_button.setIconSize(_ICON_SIZE_30)
         close_button.clicked.connect(self.close)
         close_button.setToolTip("Exit Program")
         title_bar_layout.addWidget(close_button, alignment=Qt.AlignRight)
 
         run_button = QPushButton()
         run_button.setIcon(run_icon)
-        run_button.setIconSize(QSize(30, 30))
+        run_button.setIconSize(_ICON_SIZE_30)
         #run_button.clicked.disconnect()  # Remove previous connection if any
         run_button.clicked.connect(self.run_selected_analysis)
         run_button.setToolTip("Run Analysis")
@@ -215,8 +365,7 @@ class MainWindow(QMainWindow):
         self.tree_view = QTreeView()
         self.tree_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.tree_view.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.tree_model = QStandardItemModel()
-        self.tree_model.setHorizontalHeaderLabels(["XML Structure"])
+        self.tree_model = XmlTreeModel(self)
         self.tree_view.setModel(self.tree_model)
         self.tree_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.tree_view.setUniformRowHeights(True)
@@ -224,10 +373,7 @@ class MainWindow(QMainWindow):
         self.tree_view.header().hide()  # Hide the redundant header
         
         
-        tree_scroll_area = QScrollArea()
-        tree_scroll_area.setWidgetResizable(True)
-        tree_scroll_area.setWidget(self.tree_view)
-        tree_layout.addWidget(tree_scroll_area)
+        tree_layout.addWidget(self.tree_view)
         top_layout.addWidget(tree_container)
 
         # XML text container
@@ -242,10 +388,7 @@ class MainWindow(QMainWindow):
         # self.xml_container.textChanged.connect(self.on_text_changed)
         # Detect user edits via textChanged
         self.xml_text.textChanged.connect(self.on_text_changed)
-        xml_scroll_area = QScrollArea()
-        xml_scroll_area.setWidgetResizable(True)
-        xml_scroll_area.setWidget(self.xml_text)
-        xml_layout.addWidget(xml_scroll_area)
+        xml_layout.addWidget(self.xml_text)
         top_layout.addWidget(self.xml_container)
         
 
@@ -257,10 +400,7 @@ class MainWindow(QMainWindow):
         self.analysis_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.analysis_text.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.analysis_text.setFont(common_font)
-        analysis_scroll_area = QScrollArea()
-        analysis_scroll_area.setWidgetResizable(True)
-        analysis_scroll_area.setWidget(self.analysis_text)
-        analysis_layout.addWidget(analysis_scroll_area)
+        analysis_layout.addWidget(self.analysis_text)
         top_layout.addWidget(analysis_container)
 
         # endregion container
@@ -273,11 +413,8 @@ class MainWindow(QMainWindow):
         self.log_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.log_text.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.log_text.setFont(common_font)
-        log_scroll_area = QScrollArea()
-        log_scroll_area.setWidgetResizable(True)
-        log_scroll_area.setWidget(self.log_text)
         bottom_layout.addWidget(log_label)
-        bottom_layout.addWidget(log_scroll_area)
+        bottom_layout.addWidget(self.log_text)
 
         menu_bar = self.menuBar()
         self.setMenuBar(menu_bar)
@@ -285,7 +422,7 @@ class MainWindow(QMainWindow):
         file_menu = QMenu("File", self)
         menu_bar.addMenu(file_menu)
         menu_bar.setStyleSheet("QMenuBar { background-color: #2e2e2e; }")
-        menu_bar.setFont(QFont("Arial", 12))
+        menu_bar.setFont(_FONT_ARIAL_12)
 
         open_action = QAction("Open", self)
         open_action.triggered.connect(self.open_file)
@@ -310,34 +447,52 @@ class MainWindow(QMainWindow):
         display_menu.addAction(wire3d_action)
 
     def on_text_changed(self):
-        # User has edited the text container
-        if not self.is_modified:
-            self.is_modified = True
+        # User has edited the text container; stop listening until the buffer is clean again
+        if self.is_modified:
+            return
+        self.is_modified = True
         self.save_button.setEnabled(True)
+        self.xml_text.textChanged.disconnect(self.on_text_changed)
+
+    def clear_modified(self):
+        """Mark the editor buffer clean and resume watching it for edits"""
+        if self.is_modified:
+            self.xml_text.textChanged.connect(self.on_text_changed)
+        self.is_modified = False
+        self.save_button.setEnabled(False)
 
     def open_file(self):
         """Open an XML file and display its content in the XML text area"""
-        filename, _ = QFileDialog.getOpenFileName(self, "Open XML File", "", "XML Files (*.xml);;All Files (*)")
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Open XML File", self._last_dir or os.path.expanduser("~"),
+            "XML Files (*.xml);;All Files (*)", options=QFileDialog.ReadOnly)
         if filename:
             try:
-                with open(filename, 'r', encoding='utf-8-sig') as file:
-                    file_content = file.read()
-                # Validate XML before proceeding
+                # Validate XML before proceeding; libxml2 reads the file in chunks
                 try:
-                    ET.fromstring(file_content)
+                    root_elem = ET.parse(filename, _XML_PARSER).getroot()
                 except ET.ParseError as e:
                     QMessageBox.critical(self, 'Open Error', f'Invalid XML format:\n{e}')
                     return
+                # Decode straight from the mapped file, without an intermediate bytes copy
+                with open(filename, 'rb') as file, \
+                        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    file_content = str(mapped, 'utf-8-sig')
 
-                self.tree_model.clear()
-                self.tree_model.setHorizontalHeaderLabels(["XML Structure"])
-                self.parse_xml_file(filename)
+                self.parse_xml_tree(root_elem)
                 self.current_file = filename
-                self.xml_text.setText(file_content)
+                self._last_dir = os.path.dirname(filename)
+                self.xml_text.blockSignals(True)
+                self.xml_text.setPlainText(file_content)
+                self.xml_text.blockSignals(False)
+                self.clear_modified()
+                # xml_reader rebuilds the db, so nothing assembled from the previous load applies;
+                # reset first so a failed load cannot reuse it either
+                self._tk_factor = None
+                self._assembly = None
                 self.db.xml_reader(filename)
 
-                index = filename.index('.')
-                self.db.results_file = filename[:index] + '_results.txt'
+                self.db.results_file = os.path.splitext(filename)[0] + '_results.txt'
                 logging.info(f"✅ xml_reader succeeded")
                 for handler in logging.getLogger().handlers:
                     handler.flush()
@@ -347,11 +502,10 @@ class MainWindow(QMainWindow):
                 logging.info(f"📂 Log file exists: {os.path.exists(log_path)}")
 
                 try:
-                    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
-                        log_content = f.read()
-                        logging.info(f"📝 Log content length: {len(log_content)}")
-                        self.analysis_text.setPlainText(log_content)
-                        logging.info(f"✅ Log displayed in analysis_text")
+                    log_content = _read_text_file(log_path)
+                    logging.info(f"📝 Log content length: {len(log_content)}")
+                    self.analysis_text.setPlainText(log_content)
+                    logging.info(f"✅ Log displayed in analysis_text")
                 except Exception as e:
                     import traceback
                     traceback.print_exc()
@@ -366,46 +520,73 @@ class MainWindow(QMainWindow):
             return
         text = self.xml_text.toPlainText()
         # Validate XML before saving
+        data = text.encode('utf-8')
+        digest = _xml_digest(data)
+        if digest not in self._valid_xml_digests:
+            try:
+                ET.fromstring(data, _XML_PARSER)
+            except ET.ParseError as e:
+                QMessageBox.critical(self, 'Save Error', f'Invalid XML format:\n{e}')
+                return
+        self.remember_valid_xml(digest)
+        # Write to a uniquely named side file and swap it in, so a crash leaves either the
+        # old or the new file on disk, never a torn one.
+        # Resolve symlinks first so the link itself is kept and its target is updated.
+        target_file = os.path.realpath(self.current_file)
+        target_dir = os.path.dirname(target_file)
+        tmp_file = None
         try:
-            ET.fromstring(text)
-        except ET.ParseError as e:
-            QMessageBox.critical(self, 'Save Error', f'Invalid XML format:\n{e}')
-            return
-        try:
-            with open(self.current_file, 'w', encoding='utf-8') as f:
+            fd, tmp_file = tempfile.mkstemp(
+                dir=target_dir, prefix=os.path.basename(target_file) + '.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 20) as f:
                 f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target_file):
+                shutil.copymode(target_file, tmp_file)
+            os.replace(tmp_file, target_file)
+            tmp_file = None
+            if os.name == 'posix':
+                # The rename is only durable once the directory entry is on disk too
+                dir_fd = os.open(target_dir, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
             self.xml_text.document().setModified(False)
-            self.is_modified = False  # Reset modification flag
-            self.save_button.setEnabled(False)  # Disable after save            
+            self.clear_modified()  # Reset modification flag and disable Save
             QMessageBox.information(self, 'Save', f'Saved {self.current_file}')
         except Exception as e:
+            if tmp_file is not None:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
             QMessageBox.critical(self, 'Save Error', str(e))    
 
-    def parse_xml_file(self, filename):
-        """Parse the XML file and display its content in the tree view"""
-        tree_xml = ET.parse(filename)
-        root_elem = tree_xml.getroot()
-        self.insert_tree_items(self.tree_model.invisibleRootItem(), root_elem)
-        self.tree_view.expandAll()
-
-    def insert_tree_items(self, parent, element):
-        """Recursively insert items into the tree view"""
-        node = QStandardItem(element.tag)
-        parent.appendRow(node)
-        if element.text and element.text.strip():
-            for line in element.text.strip().split('\n'):
-                node.appendRow(QStandardItem(line))
-        for child in element:
-            self.insert_tree_items(node, child)
+    def remember_valid_xml(self, digest):
+        """Record digest as well-formed XML, keeping only the most recent entries"""
+        self._valid_xml_digests[digest] = True
+        self._valid_xml_digests.move_to_end(digest)
+        if len(self._valid_xml_digests) > _XML_CACHE_SIZE:
+            self._valid_xml_digests.popitem(last=False)
+
+    def parse_xml_tree(self, root_elem):
+        """Display the parsed XML root element in the tree view"""
+        self.tree_model.set_root_element(root_elem)
+        self.tree_view.expand(self.tree_model.index(0, 0))
 
     def fortran_to_scipy_banded_lower(self,tk):
         """
-        Convert Fortran-style lower-banded matrix (n, bw) to SciPy's (bw, n) format for lower=True.
+        Convert Fortran-style lower-banded matrix (n, bw) to SciPy's (bw, n) upper band
+        format (lower=False); for a symmetric matrix this holds the same entries.
+        ab[bw-1, :] is the main diagonal, ab[bw-1-k, k:] the k-th off-diagonal.
         tk[i, 0] = A[i, i] (main diagonal)
         tk[i, 1] = A[i, i-1] (1st subdiagonal)
         tk[i, 2] = A[i, i-2] (2nd subdiagonal)
         ...
         """
+        import numpy as np
         n, bw = tk.shape
         ab = np.zeros((bw, n))
         for band in range(bw):
@@ -413,42 +594,68 @@ class MainWindow(QMainWindow):
                 ab[bw - band - 1, i] = tk[i, band]
         return ab
 
+    def solve_stiffness(self, rhs):
+        """
+        Solve tk x = rhs for the current banded stiffness matrix.
+        The Cholesky factorization is computed on the first call and reused for every
+        further right-hand side until the matrix is reassembled.
+        """
+        from scipy.linalg import LinAlgError
+        from scipy.linalg.lapack import dpbtrf, dpbtrs, dpttrf, dpttrs
+        if self._tk_factor is None:
+            ab = self.fortran_to_scipy_banded_lower(self.db.tk)
+            if ab.shape[0] == 2:
+                # Tridiagonal system: LAPACK ?pttrf is cheaper than the general band factorization
+                d, e, info = dpttrf(ab[1], ab[0, 1:])
+                factor = (d, e)
+            else:
+                c, info = dpbtrf(ab, lower=0)
+                factor = (c,)
+            if info != 0:
+                raise LinAlgError(f"Stiffness matrix is not positive definite (info={info})")
+            self._tk_factor = factor
+        b = rhs.reshape(rhs.shape[0], -1)
+        if len(self._tk_factor) == 2:
+            x, info = dpttrs(*self._tk_factor, b)
+        else:
+            x, info = dpbtrs(self._tk_factor[0], b, lower=0)
+        if info != 0:
+            raise LinAlgError(f"Banded solve failed (info={info})")
+        return x.reshape(rhs.shape)
+
     def run_analysis(self, log_file="analysis.log"):
         """Run the structural analysis"""
         self.analysis_text.append("Running analysis...\n")
-        self.db.k_assem()
-        self.analysis_text.append("Stiffness matrix completed...\n")
-        with open("stiff_output.txt", "w") as file:
-            for i in range(self.db.ne):
-                elst = self.db.stored_elst_matrices[i]
-                file.write(f"Element: {i+1}\n{elst}")
-            self.db.bound3()
-            file.write("tk matrix:\n")
-            file.write(f"{self.db.tk}")
-            file.write("al matrix:\n")
-            file.write(f"{self.db.al}")
+        if self._assembly is not None:
+            # Model not reloaded since the previous run: reuse its assembled tk/al and factorization
+            tk, al = self._assembly
+            self.db.tk = tk.copy()
+            self.db.al = al.copy()
+            self.analysis_text.append("Stiffness matrix unchanged, reusing assembly...\n")
+        else:
+            self.db.k_assem()
+            self._tk_factor = None
+            self.analysis_text.append("Stiffness matrix completed...\n")
+            with open("stiff_output.txt", "w") as file:
+                for i in range(self.db.ne):
+                    elst = self.db.stored_elst_matrices[i]
+                    file.write(f"Element: {i+1}\n{elst}")
+                self.db.bound3()
+                file.write("tk matrix:\n")
+                file.write(f"{self.db.tk}")
+                file.write("al matrix:\n")
+                file.write(f"{self.db.al}")
+            self._assembly = (self.db.tk.copy(), self.db.al.copy())
         self.analysis_text.append("Solver started...\n")
         start_time = datetime.now()
-        save_tk = self.db.tk.copy()
-        save_al = self.db.al.copy()
-        self.db.bgaussgen(self.db.tk, self.db.al)
+        self.db.al = self.solve_stiffness(self.db.al)
         end_time = datetime.now()
         execution_time = end_time - start_time
         self.analysis_text.append(f"Solver finished Time: {execution_time.total_seconds() * 1000:.2f} milliseconds\n")
-        #ab = save_tk.T
-        ab = self.fortran_to_scipy_banded_lower(save_tk)
-        print("ab shape:", ab.shape)
-        print("al shape:", save_al.shape)
-        al_scipy = solveh_banded(ab, save_al, lower=True)
-        try:
-            assert_almost_equal(self.db.al.flatten(), al_scipy, decimal=6)
-        except AssertionError:
-            self.db.al = al_scipy.reshape(self.db.al.shape)
         self.db.forcegen()
         self.db.outptgen(self.db.results_file)
-        with open(self.db.results_file, "r") as f:
-            data = f.read()
-            self.log_text.setText(data)
+        data = _read_text_file(self.db.results_file)
+        self.log_text.setText(data)
             
     def display_wireframe(self):
         """Display the wireframe 3D plot"""
@@ -472,8 +679,7 @@ class MainWindow(QMainWindow):
         anal_type = self.analysis_type_combo.currentText()
         if anal_type == "Static Linear":
             self.db.run_analysis(anal_type)
-            with open(self.db.results_file, "r") as f:
-                data = f.read()
+            data = _read_text_file(self.db.results_file)
             self.log_text.setText(data)
         elif anal_type == "Static Nonlinear":
             #self.db.run_newton_loop()
@@ -494,6 +700,8 @@ class MainWindow(QMainWindow):
 
 def main():
     app = QApplication(sys.argv)
+    app.setStyleSheet(_APP_STYLE)
+    from strudbpkg.structuraldb import StructuralDatabase
     db=StructuralDatabase()
     main_window = MainWindow(db)
     main_window.show()